@@ -1,9 +1,10 @@
 import asyncio
+import concurrent.futures
 import datetime
-import json
 import logging
 import os
-from typing import TYPE_CHECKING, List, Union
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
 import aiohttp
 import asyncpg
@@ -24,40 +25,185 @@ log = logging.getLogger("logger")
 
 extensions = ["cogs.admin", "cogs.meta", "cogs.tracking", "cogs.settings"]
 
+# each entry moves the schema up one version, so only append to this list
+MIGRATIONS: List[str] = [
+    """CREATE TABLE IF NOT EXISTS avatars (
+       id SERIAL PRIMARY KEY,
+       user_id BIGINT,
+       filename TEXT,
+       hash TEXT,
+       recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
+       );
+
+       CREATE TABLE IF NOT EXISTS nicks (
+       id SERIAL PRIMARY KEY,
+       user_id BIGINT,
+       guild_id BIGINT,
+       nick TEXT,
+       recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
+       );
+
+       CREATE TABLE IF NOT EXISTS names (
+       id SERIAL PRIMARY KEY,
+       user_id BIGINT,
+       name TEXT,
+       recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
+       );
+
+       CREATE TABLE IF NOT EXISTS presences (
+       id SERIAL PRIMARY KEY,
+       user_id BIGINT,
+       status TEXT,
+       recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
+       );
+
+       CREATE TABLE IF NOT EXISTS user_config (
+       id BIGINT PRIMARY KEY,
+       theme INTEGER DEFAULT 0
+       );
+
+       CREATE TABLE IF NOT EXISTS schema_version (
+       version INTEGER NOT NULL
+       );
+
+       CREATE INDEX IF NOT EXISTS avatars_user_id_recorded_at_idx ON avatars (user_id, recorded_at DESC);
+       CREATE INDEX IF NOT EXISTS names_user_id_recorded_at_idx ON names (user_id, recorded_at DESC);
+       CREATE INDEX IF NOT EXISTS nicks_user_id_guild_id_recorded_at_idx ON nicks (user_id, guild_id, recorded_at DESC);
+       CREATE INDEX IF NOT EXISTS presences_user_id_recorded_at_idx ON presences (user_id, recorded_at DESC);
+    """,
+    """UPDATE user_config SET theme=0 WHERE theme IS NULL OR theme NOT IN (0, 1);
+
+       ALTER TABLE user_config
+       ALTER COLUMN theme TYPE SMALLINT,
+       ALTER COLUMN theme SET NOT NULL,
+       ADD CONSTRAINT user_config_theme_check CHECK (theme IN (0, 1));
+    """,
+    """CREATE TABLE IF NOT EXISTS nicks_latest (
+       user_id BIGINT,
+       guild_id BIGINT,
+       nick TEXT,
+       PRIMARY KEY (user_id, guild_id)
+       );
+
+       CREATE TABLE IF NOT EXISTS presences_latest (
+       user_id BIGINT PRIMARY KEY,
+       status TEXT
+       );
+
+       INSERT INTO nicks_latest (user_id, guild_id, nick)
+       SELECT DISTINCT ON (user_id, guild_id) user_id, guild_id, nick
+       FROM nicks
+       WHERE user_id IS NOT NULL AND guild_id IS NOT NULL
+       ORDER BY user_id, guild_id, recorded_at DESC;
+
+       INSERT INTO presences_latest (user_id, status)
+       SELECT DISTINCT ON (user_id) user_id, status
+       FROM presences
+       WHERE user_id IS NOT NULL
+       ORDER BY user_id, recorded_at DESC;
+    """,
+    """ALTER TABLE user_config
+       DROP CONSTRAINT user_config_theme_check,
+       ADD CONSTRAINT user_config_theme_check CHECK (theme >= 0);
+    """,
+]
+
+MIGRATION_TIMEOUT = 60*60
+
+
+MISSING = object()
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+
+def drop_unchanged(
+    rows: List[R],
+    latest: Dict[K, Any],
+    key: Callable[[R], K],
+    value: Callable[[R], Any],
+) -> List[R]:
+    """Filters out rows whose value is the same as the previous one for that key.
+
+    Rows are compared in order against the latest value in ``latest``, so
+    a value that changes and then changes back is still kept.
+    """
+
+    previous: Dict[K, Any] = {}
+    changed = []
+
+    for row in rows:
+        row_key = key(row)
+        row_value = value(row)
+
+        if row_key not in previous:
+            previous[row_key] = latest.get(row_key, MISSING)
+
+        if previous[row_key] != row_value:
+            changed.append(row)
+            previous[row_key] = row_value
+
+    return changed
+
+
+def list_images() -> List[str]:
+    os.makedirs("images", exist_ok=True)
+
+    with os.scandir("images") as entries:
+        return [entry.name for entry in entries if entry.is_file() and not entry.name.endswith(".tmp")]
+
 
 class Logger(commands.Bot):
 
     db: asyncpg.Pool
     log: logging.Logger
     startup_time: datetime.datetime
+    startup_monotonic: float
     session: aiohttp.ClientSession
+    io_executor: concurrent.futures.ThreadPoolExecutor
 
     def __init__(self):
         super().__init__(command_prefix=config.prefix, intents=discord.Intents.all())
 
         self.db_lock = asyncio.Lock()
+        self.avatar_semaphore = asyncio.Semaphore(32)
+        self.saved_avatars: Set[str] = set()
+        self._avatar_downloads: Dict[str, asyncio.Task[bool]] = {}
+
+        self.latest_avatars: Dict[int, str] = {}
+        self.latest_names: Dict[int, str] = {}
+        self.latest_nicks: Dict[Tuple[int, int], str] = {}
+        self.latest_presences: Dict[int, Optional[str]] = {}
+        self._loaded_users: Set[int] = set()
+        self._loaded_members: Set[int] = set()
         self.startup_time = None
         self.log = log
 
     async def setup_hook(self):
-        if not os.path.isdir("images"):
-            os.mkdir("images")
-
-        self.session = aiohttp.ClientSession()
-
-        async def init(conn):
-            await conn.set_type_codec(
-                "jsonb",
-                schema="pg_catalog",
-                encoder=json.dumps,
-                decoder=json.loads,
-                format="text",
-            )
+        self.io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="logger-io")
+
+        images = await asyncio.get_running_loop().run_in_executor(self.io_executor, list_images)
+        self.saved_avatars.update(images)
+
+        connector = aiohttp.TCPConnector(limit=128, limit_per_host=32, ttl_dns_cache=300, enable_cleanup_closed=True)
+        timeout = aiohttp.ClientTimeout(total=30, connect=10)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"User-Agent": f"Logger (discord.py {discord.__version__})"},
+        )
 
         log.info("Connecting to database.")
 
         try:
-            db = await asyncpg.create_pool(config.database_uri, init=init)
+            db = await asyncpg.create_pool(
+                config.database_uri,
+                min_size=4,
+                max_size=getattr(config, "db_max_size", 32),
+                max_inactive_connection_lifetime=300,
+                command_timeout=60,
+                statement_cache_size=1024,
+            )
         except Exception:
             log.exception("Failed to connect to database")
             raise
@@ -66,123 +212,264 @@ class Logger(commands.Bot):
                 assert db
             self.db = db
 
-        query = """CREATE TABLE IF NOT EXISTS avatars (
-                   id SERIAL PRIMARY KEY,
-                   user_id BIGINT,
-                   filename TEXT,
-                   hash TEXT,
-                   recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
-                   );
-
-                   CREATE TABLE IF NOT EXISTS nicks (
-                   id SERIAL PRIMARY KEY,
-                   user_id BIGINT,
-                   guild_id BIGINT,
-                   nick TEXT,
-                   recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
-                   );
-
-                   CREATE TABLE IF NOT EXISTS names (
-                   id SERIAL PRIMARY KEY,
-                   user_id BIGINT,
-                   name TEXT,
-                   recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
-                   );
-
-                   CREATE TABLE IF NOT EXISTS presences (
-                   id SERIAL PRIMARY KEY,
-                   user_id BIGINT,
-                   status TEXT,
-                   recorded_at TIMESTAMP DEFAULT (now() at time zone 'utc')
-                   );
-
-                   CREATE TABLE IF NOT EXISTS user_config (
-                   id BIGINT PRIMARY KEY,
-                   theme INTEGER DEFAULT 0
-                   );
-                """
-        await self.db.execute(query)
+        await self.migrate()
 
         await self.load_extension("jishaku")
 
-        for extension in extensions:
-            await self.load_extension(extension)
+        await asyncio.gather(*(self.load_extension(extension) for extension in extensions))
 
-    async def get_user_updates(self, users: List[Union[discord.User, discord.Member]]):
-        query = """SELECT DISTINCT ON (avatars.user_id) *
-                   FROM avatars
-                   ORDER BY avatars.user_id, avatars.recorded_at DESC
-                """
+    async def migrate(self) -> None:
+        try:
+            version = await self.db.fetchval("SELECT version FROM schema_version")
+        except asyncpg.UndefinedTableError:
+            version = None
 
-        avatars = {avatar["user_id"]: avatar for avatar in await self.db.fetch(query)}
+        version = version or 0
+        if version >= len(MIGRATIONS):
+            return
 
-        query = """SELECT DISTINCT ON (names.user_id) *
-                   FROM names
-                   ORDER BY names.user_id, names.recorded_at DESC
-                """
+        log.info("Migrating database schema from version %s to %s.", version, len(MIGRATIONS))
 
-        names = {name["user_id"]: name for name in await self.db.fetch(query)}
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                for migration in MIGRATIONS[version:]:
+                    await conn.execute(migration, timeout=MIGRATION_TIMEOUT)
 
+                await conn.execute("DELETE FROM schema_version", timeout=MIGRATION_TIMEOUT)
+                await conn.execute("INSERT INTO schema_version (version) VALUES ($1)", len(MIGRATIONS), timeout=MIGRATION_TIMEOUT)
 
-        avatar_batch = []
-        name_batch = []
+    def save_avatar(self, user: Union[discord.User, discord.Member]) -> Awaitable[Optional[Tuple[int, str, str]]]:
+        avatar = user.display_avatar
+        if user.avatar:
+            asset = avatar.with_format("webp").with_size(512)
+            filename = f"{user.id}-{avatar.key}.webp"
+        else:
+            asset = avatar.with_format("png")
+            filename = f"{avatar.key}.png"
 
-        for user in users:
-            if user.id not in avatars or avatars[user.id]["hash"] != user.display_avatar.key:
-                try:
-                    filename = f"{f'{user.id}-' if user.avatar else ''}{user.display_avatar.key}.png"
-                    await user.display_avatar.with_format("png").save(f"images/{filename}")
-
-                    avatar_batch.append({
-                        "user_id": user.id,
-                        "filename": filename,
-                        "hash": user.display_avatar.key
-                    })
-                except discord.NotFound:
+        return self._download_avatar((user.id, filename, avatar.key), asset, user.name)
+
+    async def _download_avatar(
+        self,
+        record: Tuple[int, str, str],
+        avatar: discord.Asset,
+        name: str,
+    ) -> Optional[Tuple[int, str, str]]:
+        user_id, filename, _ = record
+
+        if filename in self.saved_avatars:
+            return record
+
+        # every caller for a file that's still being written awaits the same shielded download,
+        # so none of them return a record before it exists or cancel it for the others
+        download = self._avatar_downloads.get(filename)
+        if download is None:
+            download = asyncio.create_task(self._fetch_avatar(filename, avatar, name, user_id))
+            self._avatar_downloads[filename] = download
+            download.add_done_callback(lambda _: self._avatar_downloads.pop(filename, None))
+
+        if not await asyncio.shield(download):
+            return None
+
+        return record
+
+    async def _fetch_avatar(self, filename: str, avatar: discord.Asset, name: str, user_id: int) -> bool:
+        async with self.avatar_semaphore:
+            async with self.session.get(str(avatar.url)) as resp:
+                if resp.status == 404:
                     log.warning(
                         "Failed to fetch avatar %s for %s (%s). Ignoring.",
-                        user.display_avatar.url,
-                        user.name,
-                        user.id
-                    )
+                        avatar.url,
+                        name,
+                        user_id
+                        )
+                    return False
+
+                resp.raise_for_status()
+
+                loop = asyncio.get_running_loop()
+                path = f"images/{filename}"
+
+                file = await loop.run_in_executor(self.io_executor, open, f"{path}.tmp", "wb")
+                try:
+                    async for chunk in resp.content.iter_chunked(65536):
+                        await loop.run_in_executor(self.io_executor, file.write, chunk)
+                finally:
+                    await loop.run_in_executor(self.io_executor, file.close)
+
+                # only expose complete files under the real name
+                await loop.run_in_executor(self.io_executor, os.replace, f"{path}.tmp", path)
+
+        self.saved_avatars.add(filename)
+        return True
+
+    async def load_user_snapshot(self, user_ids: List[int]) -> None:
+        avatars_query = """SELECT DISTINCT ON (avatars.user_id) avatars.user_id, avatars.hash
+                           FROM avatars
+                           WHERE avatars.user_id = ANY($1::bigint[])
+                           ORDER BY avatars.user_id, avatars.recorded_at DESC
+                        """
+
+        names_query = """SELECT DISTINCT ON (names.user_id) names.user_id, names.name
+                         FROM names
+                         WHERE names.user_id = ANY($1::bigint[])
+                         ORDER BY names.user_id, names.recorded_at DESC
+                      """
+
+        avatar_records, name_records = await asyncio.gather(
+            self.db.fetch(avatars_query, user_ids),
+            self.db.fetch(names_query, user_ids),
+        )
+
+        self.latest_avatars.update((avatar["user_id"], avatar["hash"]) for avatar in avatar_records)
+        self.latest_names.update((name["user_id"], name["name"]) for name in name_records)
+        self._loaded_users.update(user_ids)
+
+    async def load_member_snapshot(self, user_ids: List[int]) -> None:
+        nicks_query = """SELECT nicks_latest.user_id, nicks_latest.guild_id, nicks_latest.nick
+                         FROM nicks_latest
+                         WHERE nicks_latest.user_id = ANY($1::bigint[])
+                      """
+
+        presences_query = """SELECT presences_latest.user_id, presences_latest.status
+                             FROM presences_latest
+                             WHERE presences_latest.user_id = ANY($1::bigint[])
+                          """
+
+        nick_records, presence_records = await asyncio.gather(
+            self.db.fetch(nicks_query, user_ids),
+            self.db.fetch(presences_query, user_ids),
+        )
+
+        self.latest_nicks.update(((nick["user_id"], nick["guild_id"]), nick["nick"]) for nick in nick_records)
+        self.latest_presences.update((presence["user_id"], presence["status"]) for presence in presence_records)
+        self._loaded_members.update(user_ids)
+
+    async def get_user_updates(self, users: List[Union[discord.User, discord.Member]]):
+        missing = list({user.id for user in users if user.id not in self._loaded_users})
+        if missing:
+            await self.load_user_snapshot(missing)
+
+        avatar_downloads = []
+        name_batch = []
 
-            if user.id not in names or names[user.id]["name"] != user.name:
-                name_batch.append({"user_id": user.id, "name": user.name})
+        for user in users:
+            if self.latest_avatars.get(user.id) != user.display_avatar.key:
+                avatar_downloads.append(self.save_avatar(user))
+
+            if self.latest_names.get(user.id) != user.name:
+                name_batch.append((user.id, user.name))
+
+        avatar_batch = []
+
+        for result in await asyncio.gather(*avatar_downloads, return_exceptions=True):
+            if isinstance(result, BaseException):
+                log.warning("Failed to download an avatar.", exc_info=result)
+            elif result:
+                avatar_batch.append(result)
 
         return avatar_batch, name_batch
 
     async def get_member_updates(self, members: List[discord.Member]):
-        query = """SELECT DISTINCT ON (nicks.guild_id, nicks.user_id) *
-                   FROM nicks
-                   ORDER BY nicks.guild_id, nicks.user_id, nicks.recorded_at DESC
-                """
+        missing = list({member.id for member in members if member.id not in self._loaded_members})
+        if missing:
+            await self.load_member_snapshot(missing)
 
-        nicks = {(nick["user_id"], nick["guild_id"]): nick for nick in await self.db.fetch(query)}
+        nick_batch = [
+            (member.id, member.guild.id, member.nick)
+            for member in members
+            if member.nick and self.latest_nicks.get((member.id, member.guild.id)) != member.nick
+        ]
 
-        query = """SELECT DISTINCT ON (presences.user_id) *
-                   FROM presences
-                   ORDER BY presences.user_id, presences.recorded_at DESC
-                """
+        unique_members = {member.id: member for member in members}
+        presence_batch = []
 
-        presences = {presence["user_id"]: presence for presence in await self.db.fetch(query)}
+        for user_id, member in unique_members.items():
+            status = member.raw_status
+            if user_id not in self.latest_presences or self.latest_presences[user_id] != status:
+                presence_batch.append((user_id, status))
 
-        nick_batch = []
-        presence_batch = []
-        _processed_presences = []
+        return nick_batch, presence_batch
 
-        for member in members:
-            if member.nick and ((member.id, member.guild.id) not in nicks or nicks[(member.id, member.guild.id)]["nick"] != member.nick):
-                nick_batch.append({
-                    "user_id": member.id,
-                    "guild_id": member.guild.id,
-                    "nick": member.nick,
-                })
+    async def insert_batches(
+        self,
+        avatar_batch: List[Tuple[int, str, str]],
+        name_batch: List[Tuple[int, str]],
+        nick_batch: List[Tuple[int, int, str]],
+        presence_batch: List[Tuple[int, Optional[str]]],
+        *,
+        durable: bool = True,
+    ) -> Tuple[int, int, int, int]:
+        avatar_batch = drop_unchanged(avatar_batch, self.latest_avatars, lambda row: row[0], lambda row: row[2])
+        name_batch = drop_unchanged(name_batch, self.latest_names, lambda row: row[0], lambda row: row[1])
+        nick_batch = drop_unchanged(nick_batch, self.latest_nicks, lambda row: (row[0], row[1]), lambda row: row[2])
+        presence_batch = drop_unchanged(presence_batch, self.latest_presences, lambda row: row[0], lambda row: row[1])
+
+        if not any((avatar_batch, name_batch, nick_batch, presence_batch)):
+            return 0, 0, 0, 0
+
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                if not durable:
+                    await conn.execute("SET LOCAL synchronous_commit = off")
+
+                if avatar_batch:
+                    await conn.copy_records_to_table(
+                        "avatars",
+                        records=avatar_batch,
+                        columns=("user_id", "filename", "hash"),
+                    )
 
-            if (member.id not in presences or presences[member.id]["status"] != str(member.status)) and member.id not in _processed_presences:
-                _processed_presences.append(member.id)
-                presence_batch.append({"user_id": member.id, "status": str(member.status)})
+                if name_batch:
+                    await conn.copy_records_to_table(
+                        "names",
+                        records=name_batch,
+                        columns=("user_id", "name"),
+                    )
 
-        return nick_batch, presence_batch
+                if nick_batch:
+                    await conn.copy_records_to_table(
+                        "nicks",
+                        records=nick_batch,
+                        columns=("user_id", "guild_id", "nick"),
+                    )
+
+                    latest = {(user_id, guild_id): nick for user_id, guild_id, nick in nick_batch}
+                    query = """INSERT INTO nicks_latest (user_id, guild_id, nick)
+                               SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::text[])
+                               ON CONFLICT (user_id, guild_id) DO UPDATE SET
+                                    nick=EXCLUDED.nick
+                               WHERE nicks_latest.nick IS DISTINCT FROM EXCLUDED.nick;
+                            """
+                    await conn.execute(
+                        query,
+                        [user_id for user_id, _ in latest],
+                        [guild_id for _, guild_id in latest],
+                        list(latest.values()),
+                    )
+
+                if presence_batch:
+                    await conn.copy_records_to_table(
+                        "presences",
+                        records=presence_batch,
+                        columns=("user_id", "status"),
+                    )
+
+                    latest = dict(presence_batch)
+                    query = """INSERT INTO presences_latest (user_id, status)
+                               SELECT * FROM unnest($1::bigint[], $2::text[])
+                               ON CONFLICT (user_id) DO UPDATE SET
+                                    status=EXCLUDED.status
+                               WHERE presences_latest.status IS DISTINCT FROM EXCLUDED.status;
+                            """
+                    await conn.execute(query, list(latest), list(latest.values()))
+
+        self.latest_avatars.update((user_id, avatar_hash) for user_id, _, avatar_hash in avatar_batch)
+        self.latest_names.update(name_batch)
+        self.latest_nicks.update(((user_id, guild_id), nick) for user_id, guild_id, nick in nick_batch)
+        self.latest_presences.update(presence_batch)
+
+        return len(avatar_batch), len(name_batch), len(nick_batch), len(presence_batch)
 
     async def on_ready(self):
         log.info("Logged in as %s - %s.", self.user.name, self.user.id)
@@ -191,54 +478,35 @@ class Logger(commands.Bot):
 
         if not self.startup_time:
             self.startup_time = discord.utils.utcnow()
+            self.startup_monotonic = time.monotonic()
 
         async with self.db_lock:
             # checking for missed events or initial startup
-            users = [discord.User._copy(user) for user in bot.users]
-            members =[discord.Member._copy(member) for member in self.get_all_members()]
-
-            log.info("Looking for user related changes...")
-            avatar_batch, name_batch = await self.get_user_updates(users)
+            users = self.users
+            members = list(self.get_all_members())
 
-            log.info("Looking for member related changes...")
-            nick_batch, presence_batch = await self.get_member_updates(members)
+            log.info("Looking for user and member related changes...")
+            (avatar_batch, name_batch), (nick_batch, presence_batch) = await asyncio.gather(
+                self.get_user_updates(users),
+                self.get_member_updates(members),
+            )
 
             log.info("Applying changes to the database...")
 
-            query = """INSERT INTO avatars (user_id, filename, hash)
-                       SELECT x.user_id, x.filename, x.hash
-                       FROM jsonb_to_recordset($1::jsonb) AS
-                       x(user_id BIGINT, filename TEXT, hash TEXT);
-                    """
-            await self.db.execute(query, avatar_batch)
-
-            query = """INSERT INTO names (user_id, name)
-                       SELECT x.user_id, x.name
-                       FROM jsonb_to_recordset($1::jsonb) AS
-                       x(user_id BIGINT, name TEXT)
-                    """
-            await self.db.execute(query, name_batch)
-
-            query = """INSERT INTO nicks (user_id, guild_id, nick)
-                       SELECT x.user_id, x.guild_id, x.nick
-                       FROM jsonb_to_recordset($1::jsonb) AS
-                       x(user_id BIGINT, guild_id BIGINT, nick TEXT);
-                    """
-            await self.db.execute(query, nick_batch)
-
-            query = """INSERT INTO presences (user_id, status)
-                       SELECT x.user_id, x.status
-                       FROM jsonb_to_recordset($1::jsonb) AS
-                       x(user_id BIGINT, guild_id BIGINT, status TEXT);
-                    """
-            await self.db.execute(query, presence_batch)
+            avatars, names, nicks, presences = await self.insert_batches(
+                avatar_batch,
+                name_batch,
+                nick_batch,
+                presence_batch,
+                durable=False,
+            )
 
             log.info(
                 "Registered %s, %s, %s, and %s to the database on startup.",
-                format(formats.plural(len(avatar_batch)), "avatar"),
-                format(formats.plural(len(name_batch)), "name"),
-                format(formats.plural(len(nick_batch)), "nick"),
-                format(formats.plural(len(presence_batch)), "presence")
+                format(formats.plural(avatars), "avatar"),
+                format(formats.plural(names), "name"),
+                format(formats.plural(nicks), "nick"),
+                format(formats.plural(presences), "presence")
             )
 
     async def get_context(
@@ -254,7 +522,10 @@ class Logger(commands.Bot):
     async def close(self):
         await self.db.close()
         await self.session.close()
+        self.io_executor.shutdown(wait=False)
         await super().close()
 
-bot = Logger()
-bot.run()
+# draw workers are spawned and re-import this module, so they must not start the bot
+if __name__ == "__main__":
+    bot = Logger()
+    bot.run()
@@ -3,14 +3,13 @@ from __future__ import annotations
 import asyncio
 import importlib
 import io
-import os
 import re
-import subprocess
 import sys
 import time
 import traceback
 from typing import TYPE_CHECKING
 
+import asyncpg
 import discord
 import humanize
 import psutil
@@ -23,6 +22,9 @@ from .utils.context import Context
 if TYPE_CHECKING:
     from bot import Logger
 
+_GIT_PULL_REGEX = re.compile(r"^\s*(?P<filename>.+?)\s*\|\s*[0-9]+\s*[+-]+", re.MULTILINE)
+SQL_ROW_LIMIT = 200
+
 
 class Admin(commands.Cog):
     def __init__(self, bot: Logger):
@@ -30,6 +32,9 @@ class Admin(commands.Cog):
         self.hidden = True
 
     async def cog_check(self, ctx):
+        if ctx.author.id == self.bot.owner_id or ctx.author.id in self.bot.owner_ids:
+            return True
+
         return await self.bot.is_owner(ctx.author)
 
     @commands.command(name="reload", description="Reload an extension")
@@ -63,20 +68,24 @@ class Admin(commands.Cog):
     async def update(self, ctx: Context):
         async with ctx.typing():
             # Run git pull to update bot
-            process = await asyncio.create_subprocess_shell("git pull", stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            process = await asyncio.create_subprocess_exec(
+                "git",
+                "pull",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
             stdout, stderr = await process.communicate()
-            text = stdout.decode()
+            text = stdout.decode("utf-8", errors="replace")
 
             # Find modules that need reloading
             modules = []
-            regex = re.compile(r"\s*(?P<filename>.+?)\s*\|\s*[0-9]+\s*[+-]+")
-            files = regex.findall(text)
-
-            for file in files:
-                root, module = os.path.splitext(file)
-                if module != ".py":
+            for match in _GIT_PULL_REGEX.finditer(text):
+                file = match.group("filename")
+                if not file.startswith("cogs/") or not file.endswith(".py"):
                     continue
-                if root.startswith("cogs/") and root.count("/") == 1:
+
+                root = file[:-3]
+                if root.count("/") == 1:
                     modules.append((root.count("/")-1, root.replace("/", ".")))
 
             modules.sort(reverse=True)
@@ -106,7 +115,7 @@ class Admin(commands.Cog):
             else:
                 try:
                     try:
-                        await elf.bot.reload_extension(module)
+                        await self.bot.reload_extension(module)
                     except commands.ExtensionNotLoaded:
                         await self.bot.load_extension(module)
                     results.append((True, module))
@@ -130,15 +139,22 @@ class Admin(commands.Cog):
 
         execute = query.count(";") > 1
 
-        if execute:
-            method = self.bot.db.execute
-        else:
-            method = self.bot.db.fetch
-
         try:
-            start = time.time()
-            results = await method(query)
-            end = time.time()
+            start = time.perf_counter()
+            if execute:
+                results = await self.bot.db.execute(query)
+            else:
+                results = []
+                try:
+                    async with self.bot.db.acquire() as conn, conn.transaction():
+                        async for record in conn.cursor(query):
+                            results.append(record)
+                            if len(results) > SQL_ROW_LIMIT:
+                                break
+                except asyncpg.ActiveSQLTransactionError:
+                    execute = True
+                    results = await self.bot.db.execute(query)
+            end = time.perf_counter()
         except Exception as e:
             full = "".join(traceback.format_exception(type(e), e, e.__traceback__))
             return await ctx.send(f"```py\n{full}```")
@@ -149,6 +165,11 @@ class Admin(commands.Cog):
         if execute:
             return await ctx.send(f"Executed in {int((end-start)*1000)}ms: {str(results)}")
 
+        truncated = ""
+        if len(results) > SQL_ROW_LIMIT:
+            truncated = f" (first {SQL_ROW_LIMIT} rows)"
+            results = results[:SQL_ROW_LIMIT]
+
         columns = list(results[0].keys())
         rows = [list(row.values()) for row in results]
 
@@ -158,7 +179,7 @@ class Admin(commands.Cog):
         results = str(table)
 
         try:
-            await ctx.send(f"Executed in {int((end-start)*1000)}ms\n```{results}```")
+            await ctx.send(f"Executed in {int((end-start)*1000)}ms{truncated}\n```{results}```")
         except discord.HTTPException:
             await ctx.send(file=discord.File(io.BytesIO(str(results).encode("utf-8")), filename="result.txt"))
 
@@ -2,18 +2,36 @@ from __future__ import annotations
 
 import datetime
 import sys
+import time
 import traceback
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, List, Optional, Tuple, Type
 
 import discord
 import humanize
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from .utils.context import Context
 
 if TYPE_CHECKING:
     from bot import Logger
 
+UNDERSCORE_TO_SPACE = str.maketrans("_", " ")
+
+async def send_missing_permissions(ctx: Context, error: commands.BotMissingPermissions) -> None:
+    perms_text = "\n".join(f"- {perm.translate(UNDERSCORE_TO_SPACE).capitalize()}" for perm in error.missing_permissions)
+    await ctx.send(f":x: Missing Permissions:\n {perms_text}", ephemeral=True)
+
+async def send_user_error(ctx: Context, error: commands.CommandError) -> None:
+    await ctx.send(f":x: {error}", ephemeral=True)
+
+ERROR_HANDLERS: Dict[Type[Exception], Optional[Callable[[Context, Any], Coroutine[Any, Any, None]]]] = {
+    commands.errors.BotMissingPermissions: send_missing_permissions,
+    commands.errors.CommandNotFound: None,
+    commands.errors.CheckFailure: None,
+    commands.errors.BadArgument: send_user_error,
+    commands.errors.MissingRequiredArgument: send_user_error,
+}
+
 class HelpCommand(commands.MinimalHelpCommand):
     def get_command_signature(self, command):
         return "{0.clean_prefix}{1.qualified_name} {1.signature}".format(self.context, command)
@@ -24,60 +42,79 @@ class Meta(commands.Cog):
         self._original_help_command = bot.help_command
         bot.help_command = HelpCommand()
         bot.help_command.cog = self
+        self._invite_url: Optional[str] = None
+        self._console_embeds: List[discord.Embed] = []
+        self._uptime: Optional[Tuple[int, str]] = None
+
+    async def cog_load(self):
+        self.console_loop.start()
 
     def cog_unload(self):
         self.bot.help_command = self._original_help_command
+        self.console_loop.stop()
 
-    @commands.Cog.listener()
-    async def on_command_error(self, ctx: Context, error):
-        print("Ignoring exception in command {}:".format(ctx.command), file=sys.stderr)
-
-        if isinstance(error, commands.errors.BotMissingPermissions):
-            perms_text = "\n".join(
-                [
-                    f"- {perm.replace('_', ' ').capitalize()}"
-                    for perm in error.missing_permissions
-                ]
-            )
-            return await ctx.send(f":x: Missing Permissions:\n {perms_text}", ephemeral=True)
-        elif isinstance(error, commands.errors.BadArgument):
-            return await ctx.send(f":x: {error}", ephemeral=True)
-        elif isinstance(error, commands.errors.MissingRequiredArgument):
-            return await ctx.send(f":x: {error}", ephemeral=True)
-        elif isinstance(error, commands.errors.CommandNotFound):
+    @tasks.loop(seconds=2.0)
+    async def console_loop(self):
+        if not self._console_embeds:
             return
-        elif isinstance(error, commands.errors.CheckFailure):
+
+        console = getattr(self.bot, "console", None)
+        if console is None:
             return
 
-        await ctx.send(f"```py\n{error}\n```")
+        if not isinstance(console, discord.abc.Messageable):
+            self.bot.log.warning("Bot console is not messageable.")
+            self._console_embeds.clear()
+            return
+
+        while self._console_embeds:
+            count = 0
+            size = 0
+            for em in self._console_embeds[:10]:
+                if count and size + len(em) > 6000:
+                    break
+                count += 1
+                size += len(em)
+
+            embeds = self._console_embeds[:count]
+            del self._console_embeds[:count]
+
+            try:
+                await console.send(embeds=embeds)
+            except Exception:
+                self.bot.log.exception("Failed to send %s error(s) to the console.", len(embeds))
+
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx: Context, error):
+        for error_type in type(error).__mro__:
+            if error_type in ERROR_HANDLERS:
+                handler = ERROR_HANDLERS[error_type]
+                if handler is not None:
+                    await handler(ctx, error)
+                return
+
+        sys.stderr.write(f"Ignoring exception in command {ctx.command}:\n")
 
         if isinstance(error, commands.CommandInvokeError):
             traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
 
             em = discord.Embed(
                 title=":warning: Error",
-                description="",
+                description=f"\nCommand: `{ctx.command}`\nLink: [Jump]({ctx.message.jump_url})\n\n```py\n{error}```\n",
                 color=discord.Color.gold(),
-                timestamp=datetime.datetime.utcnow()
+                timestamp=discord.utils.utcnow()
             )
 
-            if TYPE_CHECKING:
-                assert isinstance(em.description, str)
-
-            em.description += f"\nCommand: `{ctx.command}`"
-            em.description += f"\nLink: [Jump]({ctx.message.jump_url})"
-            em.description += f"\n\n```py\n{error}```\n"
+            self._console_embeds.append(em)
 
-            if not isinstance(self.bot.console, discord.abc.Messageable):
-                self.bot.log.warning("Bot console is not messageable.")
-                return
-
-            await self.bot.console.send(embed=em)
+        await ctx.send(f"```py\n{error}\n```")
 
     @commands.command(name="invite", description="Get an invite link")
     async def invite(self, ctx: Context):
-        invite = discord.utils.oauth_url(self.bot.user.id)  # type: ignore
-        await ctx.send(f"<{invite}>")
+        if self._invite_url is None:
+            self._invite_url = f"<{discord.utils.oauth_url(self.bot.user.id)}>"  # type: ignore
+
+        await ctx.send(self._invite_url)
 
     @commands.hybrid_command(name="ping", description="Check my latency")
     async def ping(self, ctx: Context):
@@ -85,8 +122,12 @@ class Meta(commands.Cog):
 
     @commands.hybrid_command(name="uptime", description="Check my uptime")
     async def uptime(self, ctx: Context):
-        delta = datetime.datetime.utcnow()-self.bot.startup_time
-        await ctx.send(f"I started up {humanize.naturaldelta(delta)} ago")
+        seconds = int(time.monotonic()-self.bot.startup_monotonic)
+
+        if self._uptime is None or self._uptime[0] != seconds:
+            self._uptime = (seconds, humanize.naturaldelta(datetime.timedelta(seconds=seconds)))
+
+        await ctx.send(f"I started up {self._uptime[1]} ago")
 
 async def setup(bot: Logger) -> None:
     await bot.add_cog(Meta(bot))
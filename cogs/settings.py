@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 import discord
@@ -30,15 +31,22 @@ class UserConfig:
         return self
 
 
-class ThemeConverter(commands.Converter[ThemeConverterRet]):
-    async def convert(self, ctx: Context, arg: str) -> ThemeConverterRet:
-        arg = arg.lower()
+THEME_CHOICES: Tuple[Tuple[str, app_commands.Choice[str]], ...] = tuple(
+    (lowered, app_commands.Choice(name=name, value=name)) for lowered, name in theme_module.THEME_NAMES
+)
+
 
-        for k, v in theme_module.THEME_MAPPING.items():
-            if str(v) == arg:
-                return v, k
+@cache.cache(256)
+def filter_theme_choices(current: str) -> List[app_commands.Choice[str]]:
+    return list(itertools.islice((choice for lowered, choice in THEME_CHOICES if current in lowered), 25))
 
-        raise commands.BadArgument("Invalid theme provided")
+
+class ThemeConverter(commands.Converter[ThemeConverterRet]):
+    async def convert(self, ctx: Context, arg: str) -> ThemeConverterRet:
+        try:
+            return theme_module.THEMES_BY_NAME[arg.lower()]
+        except KeyError:
+            raise commands.BadArgument("Invalid theme provided") from None
 
 
 class Settings(commands.Cog):
@@ -47,7 +55,7 @@ class Settings(commands.Cog):
     def __init__(self, bot: Logger) -> None:
         self.bot = bot
 
-    @cache.cache()
+    @cache.cache(10_000)
     async def fetch_config(self, user_id: int) -> Optional[UserConfig]:
         query = """SELECT *
                    FROM user_config
@@ -80,12 +88,14 @@ class Settings(commands.Cog):
 
         query = """INSERT INTO user_config (id, theme)
                    VALUES ($1, $2) ON CONFLICT (id) DO UPDATE SET
-                        theme=EXCLUDED.theme;
+                        theme=EXCLUDED.theme
+                   RETURNING *;
                 """
 
-        await self.bot.db.execute(query, ctx.author.id, theme_id)
+        record = await self.bot.db.fetchrow(query, ctx.author.id, theme_id)
 
-        self.fetch_config.invalidate(self, ctx.author.id)
+        key = self.fetch_config.get_key(self, ctx.author.id)
+        self.fetch_config.cache[key] = UserConfig.from_record(record)
 
         await ctx.send(f"Set theme to `{theme}`", ephemeral=True)
 
@@ -95,11 +105,7 @@ class Settings(commands.Cog):
         interaction: discord.Interaction,
         current: str
     ) -> List[app_commands.Choice[str]]:
-        themes = (str(theme) for theme in theme_module.THEMES)
-        return [
-            app_commands.Choice(name=theme, value=theme)
-            for theme in themes if current.lower() in theme.lower()
-        ]
+        return filter_theme_choices(current.lower())
 
 
 async def setup(bot: Logger) -> None:
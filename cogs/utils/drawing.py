@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import functools
+import io
+import math
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageOps
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeAlias
+
+    from .theme import Color, Theme
+
+    Presences: TypeAlias = Sequence[Tuple[datetime.datetime, Optional[str]]]
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype("arial", size)
+
+
+@functools.lru_cache(maxsize=8)
+def pie_template(background: Color, size: Tuple[int, int]) -> Image.Image:
+    image = Image.new("RGB", size, background)
+    drawing = ImageDraw.Draw(image)
+
+    drawing.rectangle([(10, 10), (110, 120)], fill="green")
+    drawing.rectangle([(10, 130), (110, 240)], fill="yellow")
+    drawing.rectangle([(10, 250), (110, 360)], fill="red")
+    drawing.rectangle([(10, 370), (110, 480)], fill="gray")
+
+    return image
+
+
+@functools.lru_cache(maxsize=4)
+def circle_mask(size: int) -> Image.Image:
+    mask = Image.new("L", (size, size), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0) + (size, size), fill=255)
+
+    return mask
+
+
+def epoch_seconds(moment: datetime.datetime) -> int:
+    return math.ceil(moment.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+
+def draw_avatars(filenames: List[str]) -> io.BytesIO:
+    file = io.BytesIO()
+
+    if len(filenames) != 1:
+        columns = max(math.isqrt(max(len(filenames)-1, 0))+1, 2)
+        rows = max(math.ceil(len(filenames)/columns), 1)
+
+        size = 2048
+
+        side_legnth = int(size/columns)
+
+        def load(filename: str) -> Image.Image:
+            return Image.open(f"images/{filename}").resize((side_legnth, side_legnth))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            avatars = list(executor.map(load, filenames))
+
+        image = Image.new("RGBA", (size, rows*side_legnth), (0, 0, 0, 0))
+
+        for counter, avatar in enumerate(avatars):
+            row, column = divmod(counter, columns)
+            image.paste(avatar, (column*side_legnth, row*side_legnth))
+
+        image.save(file, "PNG")
+
+    else:
+        image = Image.open(f"images/{filenames[0]}")
+
+        image.save(file, "PNG")
+
+    return file
+
+
+def draw_pie(presences: Presences, theme: Theme, avatar: Optional[bytes] = None) -> io.BytesIO:
+    presence_times = {"online": 0, "idle": 0, "dnd": 0, "offline": 0}
+    for counter, (recorded_at, status) in enumerate(presences):
+        if status:
+            if len(presences) > counter+1:
+                next_time = presences[counter+1][0]
+            else:
+                next_time = datetime.datetime.utcnow()
+            time = next_time-recorded_at
+            presence_times[status] = presence_times[status]+time.total_seconds()
+
+    total = sum(list(presence_times.values()))
+
+    online = (presence_times["online"]/total)
+    idle = (presence_times["idle"]/total)
+    dnd = (presence_times["dnd"]/total)
+    offline = (presence_times["offline"]/total)
+
+    width = 2048
+    height = 2048
+    shape = [(500, 500), (2000, 2000)]
+
+    angles = (0, round(online*360, 2), round((online+idle)*360, 2), round((online+idle+dnd)*360, 2), 360)
+
+    image = pie_template(theme.background, (width, height)).copy()
+    drawing = ImageDraw.Draw(image)
+    for counter, color in enumerate(("green", "yellow", "red", "gray")):
+        drawing.pieslice(shape, start=angles[counter], end=angles[counter+1], fill=color)
+
+    text = f"Online - {round(online*100, 2) or 0}% \nIdle - {round(idle*100, 2) or 0}% \nDo Not Disturb - {round(dnd*100, 2) or 0}% \nOffline - {round(offline*100, 2) or 0}%"
+    drawing.text(xy=(120, 0), text=text, fill=theme.primary, font=get_font(120), spacing=10)
+
+    if avatar:
+        avatar_size = 1000
+        shape_center = shape[0][0]+((shape[1][0]-shape[0][0])/2)
+        avatar_center = avatar_size/2
+        avatar_start = int(shape_center-avatar_center)
+
+        mask = circle_mask(avatar_size)
+
+        rounded_avatar = ImageOps.fit(Image.open(io.BytesIO(avatar)), mask.size, centering=(0.5, 0.5))
+        rounded_avatar.putalpha(mask)
+
+        image.paste(rounded_avatar, (avatar_start, avatar_start), rounded_avatar)
+
+    file = io.BytesIO()
+    image.save(file, "PNG")
+
+    return file
+
+
+def draw_chart(presences: Presences, theme: Theme, time: Optional[datetime.datetime] = None) -> io.BytesIO:
+    image = Image.new("RGB", (3480, 3200), theme.background)
+    drawing = ImageDraw.Draw(image, "RGBA")
+    font = get_font(100)
+
+    if not time:
+        time = datetime.datetime.utcnow()-datetime.timedelta(days=30)
+
+    time = datetime.datetime(year=time.year, month=time.month, day=time.day)+datetime.timedelta(days=1)
+    keys = {"online": "green", "idle": "yellow", "dnd": "red", "offline": "gray"}
+    months = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun", 7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
+
+    palette = [theme.background, *(ImageColor.getrgb(color) for color in keys.values())]
+    indexes = {status: counter for counter, status in enumerate(keys, 1)}
+
+    timestamps = [epoch_seconds(recorded_at) for recorded_at, _ in presences]
+    timestamps.append(epoch_seconds(datetime.datetime.utcnow()))
+
+    segments = []
+    for counter, (_, status) in enumerate(presences):
+        color = indexes.get(status)
+        if color and timestamps[counter+1] > timestamps[counter]:
+            segments.append((timestamps[counter], timestamps[counter+1], color))
+
+    start = epoch_seconds(time)
+    buffer = bytearray(2880*30)
+    index = 0
+    for row in range(30):
+        day_start = start+row*86400
+        day_end = day_start+86400
+
+        while index < len(segments) and segments[index][1] <= day_start:
+            index += 1
+
+        for segment_start, segment_end, color in segments[index:]:
+            if segment_start >= day_end:
+                break
+
+            first = max(-((day_start-segment_start)//30), 0)
+            last = min(-((day_start-segment_end)//30), 2880)
+            if first < last:
+                buffer[row*2880+first:row*2880+last] = bytes((color,))*(last-first)
+
+    statuses = Image.frombytes("P", (2880, 30), bytes(buffer))
+    statuses.putpalette([channel for color in palette for channel in color])
+    image.paste(statuses.resize((2880, 3000), Image.NEAREST), (600, 200))
+
+    for row in range(2, 32):
+        day_start = time+datetime.timedelta(days=row-2)
+        drawing.text(xy=(1, row*100), text=f"{day_start.strftime('%A')[:3]}, {months[day_start.month]} {day_start.day}", fill=theme.primary, font=font)
+        drawing.line(xy=[(1, row*100), (3480, row*100)], fill=theme.secondary, width=5)
+
+    for hour in range(24):
+        if hour%6 == 0:
+            drawing.text(xy=((hour*120)+600, 1), text=f"{hour}:00 UTC", fill=theme.primary, font=font)
+        drawing.line(xy=[((hour*120)+600, 200), ((hour*120)+600, 3500)], fill=theme.secondary, width=5)
+
+    file = io.BytesIO()
+    image.save(file, "PNG")
+
+    return file
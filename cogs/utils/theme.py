@@ -29,6 +29,14 @@ THEME_MAPPING: Dict[Optional[int], Theme] = {
 }
 THEMES: List[Theme] = [DARK, LIGHT]
 
+# ids are stored in user_config.theme, a SMALLINT with CHECK (theme >= 0) (see MIGRATIONS in bot.py)
+assert all(theme_id is None or 0 <= theme_id <= 32767 for theme_id in THEME_MAPPING), "theme ids must fit user_config.theme"
+
+THEMES_BY_NAME: Dict[str, Tuple[Theme, int]] = {
+    str(theme).lower(): (theme, theme_id) for theme_id, theme in THEME_MAPPING.items() if theme_id is not None
+}
+THEME_NAMES: Tuple[Tuple[str, str], ...] = tuple((str(theme).lower(), str(theme)) for theme in THEMES)
+
 
 def get_theme(theme_id: Optional[int]) -> Theme:
     return THEME_MAPPING[theme_id]